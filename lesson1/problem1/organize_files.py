@@ -5,6 +5,8 @@ Organize files in messy_data/ into structured subdirectories by file type.
 """
 
 from pathlib import Path
+import errno
+import os
 import shutil
 from datetime import datetime
 
@@ -23,6 +25,20 @@ DEST_DIRS = {
 # Supported image extensions
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif"}
 
+# Extension -> destination key (anything else goes to "other")
+EXT_TO_KEY = {".json": "json", ".csv": "csv", ".txt": "txt"}
+EXT_TO_KEY.update(dict.fromkeys(IMAGE_EXTS, "images"))
+
+
+def move_file(src, dst):
+    """Rename in place; copy + delete only when crossing filesystems."""
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
 
 def organize_files():
     if not BASE_DIR.exists():
@@ -35,27 +51,17 @@ def organize_files():
 
     summary = {k: 0 for k in DEST_DIRS.keys()}  # count files moved 计算移动的文件
 
-    for file in BASE_DIR.iterdir():
-        if file.is_file():
-            ext = file.suffix.lower()
+    # scandir entries carry cached file-type info, so no extra stat per file
+    with os.scandir(BASE_DIR) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            key = EXT_TO_KEY.get(os.path.splitext(entry.name)[1].lower(), "other")
             try:
-                if ext == ".json":
-                    shutil.move(str(file), DEST_DIRS["json"] / file.name)
-                    summary["json"] += 1
-                elif ext == ".csv":
-                    shutil.move(str(file), DEST_DIRS["csv"] / file.name)
-                    summary["csv"] += 1
-                elif ext == ".txt":
-                    shutil.move(str(file), DEST_DIRS["txt"] / file.name)
-                    summary["txt"] += 1
-                elif ext in IMAGE_EXTS:
-                    shutil.move(str(file), DEST_DIRS["images"] / file.name)
-                    summary["images"] += 1
-                else:
-                    shutil.move(str(file), DEST_DIRS["other"] / file.name)
-                    summary["other"] += 1
+                move_file(entry.path, os.path.join(DEST_DIRS[key], entry.name))
+                summary[key] += 1
             except Exception as e:
-                print(f"Error moving {file.name}: {e}")
+                print(f"Error moving {entry.name}: {e}")
 
     # Print summary 打印摘要
     print("\n--- File Organization Summary ---")
@@ -64,11 +70,14 @@ def organize_files():
 
     # Write report with timestamp 编写报告
     report_file = BASE_DIR / "organization_report.txt"
-    with open(report_file, "a", encoding="utf-8") as f:
-        f.write(f"\nReport generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        for k, v in summary.items():
-            f.write(f"{k.capitalize()} files moved: {v}\n")
-        f.write("-" * 40 + "\n")
+    lines = [
+        f"\nReport generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+        *[f"{k.capitalize()} files moved: {v}\n" for k, v in summary.items()],
+        "-" * 40 + "\n",
+    ]
+    # Build the whole entry first and append it with a single write
+    with open(report_file, "a", encoding="utf-8", buffering=1 << 16) as f:
+        f.write("".join(lines))
 
 
 if __name__ == "__main__":
@@ -7,118 +7,115 @@ and producing cleaned_customer_data.csv.
 
 import os
 import pandas as pd
-import re
-from datetime import datetime
 
 INPUT_FILE = "dirty_customer_data.csv"
 OUTPUT_FILE = "cleaned_customer_data.csv"
 REPORT_FILE = "data_quality_report.txt"
 
+# 整列.str方法使用的正则（直接传字符串，pandas对编译后的正则会退回逐个元素的慢路径）
+# 邮箱格式
+_EMAIL_PATTERN = r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$"
+# 北美电话号码：可选国家码1 + 区号/前缀/线路号
+_NANP_PATTERN = r"^1?(\d{3})(\d{3})(\d{4})$"
+_NON_DIGIT_PATTERN = r"\D"
+# 逗号、$和货币单词，一次替换全部去掉
+_CLEAN_MONEY = r",|\$|\b(?:dollars?|usd|aud|gbp|eur)\b"
 
-# ---------- Helper Functions ----------
-
-def clean_name(name):
-    """Convert to Title Case.----将输入转换为首字母大写的形式(Title Case)"""
-    if pd.isna(name):
-        return None
-    return str(name).title().strip()
-
-
-def clean_email(email):
-    """Validate and normalize email addresses."""
-    if pd.isna(email):
-        return None
-    email = str(email).strip().lower() #转换为小写
-    pattern = r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$" #标准化格式
-    return email if re.match(pattern, email) else None
-
-
-def clean_age(age):
-    """Convert age to integer if valid, else None."""
-    if pd.isnull(age):
-        return None
-    if isinstance(age, str):
-        age = age.strip().lower()
-        if age.isdigit():
-            return int(age)
-        text2num = {
-            'twenty-seven': 27, 'thirty-five': 35, 'forty-five': 45, 'twenty-two': 22,
-            'twenty-five': 25, 'thirty': 30, 'twenty-nine': 29, 'thirty-three': 33,
-            'forty-one': 41, 'twenty-eight': 28, 'thirty-one': 31
-        }
-        return text2num.get(age, None)
-    try:
-        return int(age)
-    except Exception:
-        return None
-
-
-def clean_salary(salary):
-    """Convert salary to float if valid, else None."""
-    if pd.isnull(salary):
-        return None
-    if isinstance(salary, str):
-        salary = salary.replace(',', '').replace('$', '').strip().lower()
-        if salary.isdigit():
-            return float(salary)
-        if salary == 'sixty thousand':
-            return 60000.0
-    try:
-        return float(salary)
-    except Exception:
-        return None
-
-
-def clean_phone(phone):
-    """Standardize phone number to (XXX) XXX-XXXX format."""
-    if pd.isna(phone):
-        return None
-    digits = re.sub(r"\D", "", str(phone))
-    if len(digits) == 10:
-        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-    elif len(digits) == 11 and digits.startswith('1'):
-        return f"({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
-    return None  # invalid phone number
-
-
-def clean_date(date):
-    """Standardize dates to YYYY-MM-DD format."""
-    if pd.isna(date):
-        return None
-    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%B %d, %Y", "%m/%d/%Y", "%m-%d-%Y", "%d/%m/%Y"):
-        try:
-            return datetime.strptime(str(date), fmt).strftime("%Y-%m-%d")
-        except Exception:
-            continue
-    try:
-        return pd.to_datetime(date, errors='coerce').strftime("%Y-%m-%d")
-    except Exception:
-        return None
+
+# 文本形式的年龄/薪资
+AGE_WORDS = {
+    'twenty-seven': 27, 'thirty-five': 35, 'forty-five': 45, 'twenty-two': 22,
+    'twenty-five': 25, 'thirty': 30, 'twenty-nine': 29, 'thirty-three': 33,
+    'forty-one': 41, 'twenty-eight': 28, 'thirty-one': 31
+}
+SALARY_WORDS = {'sixty thousand': 60000.0}
 
 
 # ---------- Main Cleaning Pipeline ----------
 
+def _parse_dates(values, dayfirst=False):
+    """整列解析日期为不带时区的datetime64，带时区偏移的值保留其本地时间"""
+    try:
+        dt = pd.to_datetime(values, errors='coerce', format='mixed', dayfirst=dayfirst)
+    except ValueError:
+        # 不带时区与带偏移的日期混在一起时，errors='coerce'也会抛错，改为逐个解析
+        def one(v):
+            ts = pd.to_datetime(v, errors='coerce', format='mixed', dayfirst=dayfirst)
+            return ts.tz_localize(None) if ts.tz is not None else ts
+        dt = pd.to_datetime(values.map(one))
+    if dt.dt.tz is not None:
+        dt = dt.dt.tz_localize(None)
+    return dt
+
+
+def summary_stats(df):
+    """轻量统计：形状、缺失值、数值列describe（避免对字符串列做describe(include='all')）"""
+    return {
+        'shape': df.shape,
+        'na': df.isna().sum().to_dict(),
+        'num': df.select_dtypes('number').describe().to_dict(),
+    }
+
+
+def clean_frame(df):
+    """整表向量化清洗：每列只经过一次.str/to_numeric/to_datetime处理，不再逐行apply"""
+    # 1. 移除customer_id缺失的行
+    df = df[df['customer_id'].notnull()].copy()
+
+    # 2. 处理缺失值并标准化文本
+    df['name'] = df['name'].astype('string').str.strip().str.title().fillna('')
+    # 年龄：只接受纯数字（排除27.5、-5、inf等），文字形式的年龄查表
+    age = df['age'].astype('string').str.strip().str.lower()
+    digits_only = age.where(age.str.fullmatch(r"\d+", na=False))
+    df['age'] = pd.to_numeric(digits_only, errors='coerce').astype(float).fillna(age.map(AGE_WORDS))
+    # 薪资：整列去掉逗号、$和货币单词后转数值，转换失败的再查文本表
+    salary = df['salary'].astype('string').str.lower().str.replace(_CLEAN_MONEY, "", regex=True).str.strip()
+    df['salary'] = pd.to_numeric(salary, errors='coerce').astype(float).fillna(salary.map(SALARY_WORDS))
+    # 电话号码：整列去除非数字后一次性提取三段，拼接结果中无效号码自动为NA
+    digits = df['phone'].astype('string').str.replace(_NON_DIGIT_PATTERN, "", regex=True)
+    parts = digits.str.extract(_NANP_PATTERN)
+    df['phone'] = "(" + parts[0] + ") " + parts[1] + "-" + parts[2]
+    # 日期：整列解析一次，失败的部分再按日在前(dayfirst)解析
+    join_date = _parse_dates(df['join_date'])
+    date_mask = join_date.isna() & df['join_date'].notna()
+    if date_mask.any():
+        join_date.loc[date_mask] = _parse_dates(df.loc[date_mask, 'join_date'], dayfirst=True)
+    df['join_date'] = join_date.dt.strftime('%Y-%m-%d')
+
+    # 3. 标准化email
+    email = df['email'].astype('string').str.strip().str.lower()
+    email_mask = email.str.match(_EMAIL_PATTERN, na=False)
+    df['email'] = email.where(email_mask)
+
+    # 4. 移除无效email
+    return df[email_mask]
+
+
 def generate_quality_report(df, filename, before_stats, after_stats):
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write("数据质量报告\n")
-        f.write("="*30 + "\n")
-        f.write("清洗前统计信息:\n")
-        f.write(str(before_stats) + "\n\n")
-        f.write("清洗后统计信息:\n")
-        f.write(str(after_stats) + "\n\n")
-        f.write(f"总记录数: {len(df)}\n\n")
-        for col in df.columns:
-            null_count = df[col].isnull().sum()
-            unique_count = df[col].nunique()
-            f.write(f"字段: {col}\n")
-            f.write(f"  缺失值数量: {null_count}\n")
-            f.write(f"  唯一值数量: {unique_count}\n")
-            if pd.api.types.is_numeric_dtype(df[col]):
-                f.write(f"  最小值: {df[col].min()}\n")
-                f.write(f"  最大值: {df[col].max()}\n")
-                f.write(f"  均值: {df[col].mean()}\n")
-                f.write(f"  标准差: {df[col].std()}\n")
-            f.write("\n")
+    # 先在内存中拼好整份报告，再一次性写入
+    lines = [
+        "数据质量报告\n",
+        "="*30 + "\n",
+        "清洗前统计信息:\n",
+        str(before_stats) + "\n\n",
+        "清洗后统计信息:\n",
+        str(after_stats) + "\n\n",
+        f"总记录数: {len(df)}\n\n",
+    ]
+    for col in df.columns:
+        null_count = df[col].isnull().sum()
+        unique_count = df[col].nunique()
+        lines.append(f"字段: {col}\n")
+        lines.append(f"  缺失值数量: {null_count}\n")
+        lines.append(f"  唯一值数量: {unique_count}\n")
+        if pd.api.types.is_numeric_dtype(df[col]):
+            lines.append(f"  最小值: {df[col].min()}\n")
+            lines.append(f"  最大值: {df[col].max()}\n")
+            lines.append(f"  均值: {df[col].mean()}\n")
+            lines.append(f"  标准差: {df[col].std()}\n")
+        lines.append("\n")
+    with open(filename, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        f.write("".join(lines))
 
 
 def main():
@@ -127,30 +124,15 @@ def main():
     output_path = os.path.join(BASE_DIR, 'cleaned_customer_data.csv')
     report_path = os.path.join(BASE_DIR, 'data_quality_report.txt')
 
-    df = pd.read_csv(input_path)
+    df = pd.read_csv(input_path, engine='pyarrow', dtype_backend='pyarrow')
 
     print("清洗前统计：")
-    before_stats = df.describe(include='all')
-    print(df.info())
+    before_stats = summary_stats(df)
+    df.info()
     print(before_stats)
 
-    # 1. 移除customer_id缺失的行
-    df = df[df['customer_id'].notnull()]
-
-    # 2. 处理缺失值
-    df['name'] = df['name'].fillna('')
-    df['email'] = df['email'].fillna('')
-    df['age'] = df['age'].apply(clean_age)
-    df['salary'] = df['salary'].apply(clean_salary)
-    df['phone'] = df['phone'].apply(clean_phone)
-    df['join_date'] = df['join_date'].apply(clean_date)
-
-    # 3. 标准化文本
-    df['name'] = df['name'].apply(lambda x: x.title() if isinstance(x, str) else x)
-    df['email'] = df['email'].apply(valid_email) # type: ignore
-
-    # 4. 移除无效email
-    df = df[df['email'].notnull()]
+    # 1-4. 整表向量化清洗（移除无效行、标准化各列）
+    df = clean_frame(df)
 
     # 5. 移除重复行
     df = df.drop_duplicates()
@@ -159,8 +141,8 @@ def main():
     df.to_csv(output_path, index=False)
 
     print("清洗后统计：")
-    after_stats = df.describe(include='all')
-    print(df.info())
+    after_stats = summary_stats(df)
+    df.info()
     print(after_stats)
 
     # 7. 生成数据质量报告
@@ -3,13 +3,14 @@
 clean_data.py  — Improved cleaning for numeric-words, phones, dates, emails, etc.
 - Adds text->number parsing (e.g. "sixty thousand" -> 60000)
 - Keeps counters to report how many conversions succeeded/failed
-- Uses pandas and pathlib; no external packages required
+- Uses pandas (pyarrow engine for reading the CSV), numpy and pathlib
 - 改进了对数字单词、电话、日期、电子邮件等的清理 - 添加文本>数字解析（例如“六万” -> 60000） - 保留计数器以报告成功失败的转换次数
 """
 
 import re
 from datetime import datetime
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 INPUT_FILE = "dirty_customer_data.csv"
@@ -34,8 +35,105 @@ STATS = {
     "invalid_emails_removed": 0
 }
 
+# column patterns, passed to the .str methods as plain strings (pandas sends a
+# compiled pattern down its slow per-element path)
+_EMAIL_PATTERN = r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$"
+# NANP phone: optional leading country code 1, then area / exchange / line
+_NANP_PATTERN = r"^1?(\d{3})(\d{3})(\d{4})$"
+_NON_DIGIT_PATTERN = r"\D"
+_AGE_STRIP_PATTERN = r"[^\d.-]"
+_SALARY_STRIP_PATTERN = r"[^\d.\-kKmM]"  # keep numbers, dot, - and k/m
+
 
 # -------- text -> number utility (supports up to billions) --------
+# words -> number mapping
+UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19
+}
+TENS = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90
+}
+SCALES = {"hundred": 100, "thousand": 1_000, "million": 1_000_000, "billion": 1_000_000_000}
+
+# multipliers for the numeric shorthand suffix ("60k", "2.5m")
+SUFFIX_SCALE = {"": 1, "k": 1_000, "m": 1_000_000}
+
+
+def _build_word2num():
+    """
+    Enumerate the common number phrases for realistic ages/salaries:
+    1-999 spelled out, optionally followed by "thousand", "million" or
+    "billion" (e.g. "sixty thousand", "one hundred twenty five"), plus
+    "{11-99} hundred" ("nineteen hundred"). Anything else, such as
+    "sixty thousand five hundred", goes through _accumulate_words.
+    Keys are normalized: words separated by a single space, no "and".
+    """
+    below_hundred = {w: v for w, v in UNITS.items() if v}
+    below_hundred.update(TENS)
+    for t, tv in TENS.items():
+        for u, uv in UNITS.items():
+            if 0 < uv < 10:
+                below_hundred[f"{t} {u}"] = tv + uv
+
+    below_thousand = dict(below_hundred)
+    below_thousand["hundred"] = 100
+    for h, hv in UNITS.items():
+        if 0 < hv < 10:
+            below_thousand[f"{h} hundred"] = hv * 100
+            for rest, rv in below_hundred.items():
+                below_thousand[f"{h} hundred {rest}"] = hv * 100 + rv
+
+    table = {k: float(v) for k, v in below_thousand.items()}
+    for scale in ("thousand", "million", "billion"):
+        sv = SCALES[scale]
+        table[scale] = float(sv)
+        for phrase, v in below_thousand.items():
+            table[f"{phrase} {scale}"] = float(v * sv)
+    for phrase, v in below_hundred.items():
+        if v > 10:
+            table[f"{phrase} hundred"] = float(v * 100)
+    return table
+
+
+def _accumulate_words(words):
+    """Token-by-token fallback for phrases not in WORD2NUM; None on unknown tokens."""
+    current = 0
+    total = 0
+    for w in words:
+        if w in UNITS:
+            current += UNITS[w]
+        elif w in TENS:
+            current += TENS[w]
+        elif w == "and":
+            continue
+        elif w == "hundred":
+            current = (current or 1) * 100
+        elif w in SCALES:
+            total += (current or 1) * SCALES[w]
+            current = 0
+        else:
+            # unknown token — stop processing (keeps it conservative)
+            return None
+    total += current
+    return float(total) if total != 0 else None
+
+
+# normalized phrase -> value, built once at import (a few thousand entries)
+WORD2NUM = _build_word2num()
+
+# patterns text_to_number uses per value, compiled once at import
+# commas, "$" and currency words removed in a single pass
+_CLEAN_MONEY = re.compile(r",|\$|\b(?:dollars?|usd|aud|gbp|eur)\b")
+_KM_RE = re.compile(r"^([+-]?\d+(?:\.\d+)?)\s*([km]?)$")
+_NUMBER_RE = re.compile(r"[+-]?\d+(?:\.\d+)?")
+_TOKEN_SPLIT_RE = re.compile(r"[\s-]+")
+
+
 def text_to_number(s):
     """
     Convert a textual number to numeric (e.g. "sixty thousand" -> 60000).
@@ -54,214 +152,145 @@ def text_to_number(s):
     s0 = str(s).lower().strip()
     if s0 == "":
         return None
+    # already a normalized phrase ("sixty thousand"): the table holds the final value
+    if s0 in WORD2NUM:
+        return WORD2NUM[s0]
 
     # quick cleanup
-    s0 = s0.replace(",", "")
-    s0 = re.sub(r"\b(dollars?|usd|aud|gbp|eur)\b", "", s0)
-    s0 = s0.strip()
+    s0 = _CLEAN_MONEY.sub("", s0).strip()
 
     # handle numeric with k/m shorthand: 60k, 2.5M, $60k, 60k USD
-    m = re.match(r"^([+-]?\d+(\.\d+)?)(\s*[kKmM])?$", s0)
+    m = _KM_RE.match(s0)
     if m:
-        base = float(m.group(1))
-        suffix = (m.group(3) or "").strip().lower()
-        if suffix == "k":
-            return base * 1_000
-        if suffix == "m":
-            return base * 1_000_000
-        return base
+        return float(m.group(1)) * SUFFIX_SCALE[m.group(2)]
 
     # fallback: try to extract a plain float even if other text exists (e.g. "approx 60000")
-    m2 = re.search(r"([+-]?\d+(\.\d+)?)", s0)
+    m2 = _NUMBER_RE.search(s0)
     if m2:
-        return float(m2.group(1))
-
-    # words -> number mapping
-    units = {
-        "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-        "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
-        "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
-        "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
-        "nineteen": 19
-    }
-    tens = {
-        "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
-        "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90
-    }
-    scales = {"hundred": 100, "thousand": 1_000, "million": 1_000_000, "billion": 1_000_000_000}
-
-    words = re.split(r"[\s-]+", s0)  # split on spaces and hyphens
-    current = 0
-    total = 0
-    for w in words:
-        if w in units:
-            current += units[w]
-        elif w in tens:
-            current += tens[w]
-        elif w == "and":
-            continue
-        elif w in scales:
-            scale = scales[w]
-            if current == 0:
-                current = 1
-            current = current * scale
-            total += current
-            current = 0
-        else:
-            # unknown token — stop processing (keeps it conservative)
-            return None
-    total += current
-    return float(total) if total != 0 else None
+        return float(m2.group())
 
-
-# -------- cleaning helper functions --------
-def clean_name(name):
-    if pd.isna(name):
-        return None
-    return str(name).strip().title()
-
-
-def clean_email(email):
-    if pd.isna(email):
-        return None
-    e = str(email).strip().lower()
-    pattern = r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$"
-    if re.match(pattern, e):
-        return e
-    STATS["invalid_emails_removed"] += 1
-    return None
+    # words: one lookup of the normalized phrase ("forty-two" -> "forty two"),
+    # falling back to summing the tokens for phrases outside the table
+    key = _TOKEN_SPLIT_RE.sub(" ", s0).replace(" and ", " ")
+    if key in WORD2NUM:
+        return WORD2NUM[key]
+    return _accumulate_words(key.split(" "))
 
 
-def clean_age(age):
-    if pd.isna(age):
-        STATS["age_failed"] += 1
-        return None
-    s = str(age).strip()
-    # try numeric first
-    try:
-        val = int(float(re.sub(r"[^\d\.-]", "", s)))
-        STATS["age_numeric_parsed"] += 1
-        return val
-    except Exception:
-        pass
-    # try text->number
-    n = text_to_number(s)
-    if n is not None:
-        STATS["age_text_parsed"] += 1
-        try:
-            return int(n)
-        except:
-            return int(float(n))
-    STATS["age_failed"] += 1
-    return None
-
-
-def clean_salary(salary):
-    if pd.isna(salary):
-        STATS["salary_failed"] += 1
-        return None
-    s = str(salary).strip()
-    # try direct numeric extraction (strip $ and commas)
-    s_digits = re.sub(r"[^\d\.\-kKmM]", "", s)  # keep numbers, dot, - and k/m
-    # attempt float with k/m suffix
+# -------- vectorized pipeline --------
+def _parse_dates(s, dayfirst=False):
+    """Parse a date column to naive datetime64; offset values keep their local wall time."""
     try:
-        m = re.match(r"^([+-]?\d+(\.\d+)?)([kKmM])?$", s_digits)
-        if m:
-            base = float(m.group(1))
-            suffix = (m.group(3) or "").lower()
-            if suffix == "k":
-                STATS["salary_numeric_parsed"] += 1
-                return base * 1_000
-            if suffix == "m":
-                STATS["salary_numeric_parsed"] += 1
-                return base * 1_000_000
-            STATS["salary_numeric_parsed"] += 1
-            return base
-    except Exception:
-        pass
-
-    # try text -> number (e.g. "sixty thousand")
-    n = text_to_number(s)
-    if n is not None:
-        STATS["salary_text_parsed"] += 1
-        return float(n)
-
-    STATS["salary_failed"] += 1
-    return None
-
-
-def clean_phone(phone):
-    if pd.isna(phone):
-        STATS["phone_failed"] += 1
-        return None
-    s = str(phone)
-    # remove common separators and wrappers
-    digits = re.sub(r"[^\d+]", "", s)
-    # if plus sign followed by digits -> keep plus
-    digits_only = re.sub(r"\D", "", s)
-
-    # US-style / NANP detection:
-    if len(digits_only) == 10:
-        STATS["phone_parsed_us"] += 1
-        return f"({digits_only[:3]}) {digits_only[3:6]}-{digits_only[6:]}"
-    if len(digits_only) == 11 and digits_only.startswith("1"):
-        STATS["phone_parsed_us"] += 1
-        d = digits_only[1:]
-        return f"({d[:3]}) {d[3:6]}-{d[6:]}"
-    # fallback: return international normalized format if possible
-    if len(digits_only) > 10:
-        STATS["phone_parsed_intl"] += 1
-        return "+" + digits_only
-    STATS["phone_failed"] += 1
-    return None
-
-
-def clean_date(val):
-    if pd.isna(val):
-        STATS["date_failed"] += 1
-        return None
-    # try pandas with multiple strategies: first default, then dayfirst
-    for dayfirst in (False, True):
-        try:
-            dt = pd.to_datetime(val, errors="coerce", dayfirst=dayfirst, infer_datetime_format=True)
-            if not pd.isna(dt):
-                STATS["date_parsed"] += 1
-                return dt.strftime("%Y-%m-%d")
-        except Exception:
-            continue
-    STATS["date_failed"] += 1
-    return None
-
-
-# -------- main pipeline --------
-def main():
-    p = Path(INPUT_FILE)
-    if not p.exists():
-        print(f"Input file not found: {INPUT_FILE}")
-        return
-
-    df = pd.read_csv(p)
-    STATS["rows_before"] = len(df)
-
+        dt = pd.to_datetime(s, errors="coerce", dayfirst=dayfirst, format="mixed")
+    except ValueError:
+        # a mix of naive and offset values raises even with errors="coerce";
+        # fall back to per-value parsing so one odd cell cannot abort the run
+        def one(v):
+            ts = pd.to_datetime(v, errors="coerce", dayfirst=dayfirst, format="mixed")
+            return ts.tz_localize(None) if ts.tz is not None else ts
+        dt = pd.to_datetime(s.map(one))
+    if dt.dt.tz is not None:
+        dt = dt.dt.tz_localize(None)
+    return dt
+
+
+def _phrase_keys(s):
+    """Column version of text_to_number's word normalization: the WORD2NUM key per value."""
+    return (s.str.replace(_CLEAN_MONEY.pattern, "", regex=True)
+             .str.strip()
+             .str.replace(_TOKEN_SPLIT_RE.pattern, " ", regex=True)
+             .str.replace(" and ", " ", regex=False))
+
+
+def clean_frame(df):
+    """
+    Clean the whole frame in one pass: every column goes through a single
+    vectorized .str / to_numeric / to_datetime chain, no per-row apply.
+    Fills the STATS counters from boolean-mask reductions.
+    """
     # Drop rows missing customer_id
     if "customer_id" in df.columns:
         df = df.dropna(subset=["customer_id"])
     else:
         print("Warning: customer_id column not present; cannot enforce primary key.")
+    df = df.copy()
 
-    # Apply cleaning functions; guard against missing columns
+    # Clean each column with vectorized kernels; guard against missing columns
     if "name" in df.columns:
-        df["name"] = df["name"].apply(clean_name)
+        df["name"] = df["name"].astype("string").str.strip().str.title()
     if "email" in df.columns:
-        df["email"] = df["email"].apply(clean_email)
+        # one regex scan over the whole column instead of clean_email per row
+        email = df["email"].astype("string").str.strip().str.lower()
+        email_mask = email.str.match(_EMAIL_PATTERN, na=False)
+        # invalid emails are removed from the cell, not the row: the rest of the
+        # record (age, salary, phone, ...) is still usable, as in the original apply
+        df["email"] = email.where(email_mask)
+        STATS["invalid_emails_removed"] = int((email.notna() & ~email_mask).sum())
     if "age" in df.columns:
-        df["age"] = df["age"].apply(clean_age)
+        s = df["age"].astype("string").str.strip().str.lower()
+        # numeric path: keep digits, dot and sign, truncate like int(float(...))
+        num = np.trunc(pd.to_numeric(s.str.replace(_AGE_STRIP_PATTERN, "", regex=True),
+                                     errors="coerce").astype(float))
+        numeric = num.notna()
+        # text path: spelled-out ages ("thirty-five") via the phrase table
+        num = num.fillna(_phrase_keys(s[~numeric]).map(WORD2NUM))
+        # rare remainder ("25-30"): text_to_number's full fallback chain, truncated like int()
+        rest = num.isna() & s.notna()
+        if rest.any():
+            num.loc[rest] = np.trunc(s[rest].map(text_to_number).astype(float))
+        df["age"] = num
+        STATS["age_numeric_parsed"] = int(numeric.sum())
+        STATS["age_text_parsed"] = int((num.notna() & ~numeric).sum())
+        STATS["age_failed"] = int(num.isna().sum())
     if "salary" in df.columns:
-        df["salary"] = df["salary"].apply(clean_salary)
+        s = df["salary"].astype("string").str.strip().str.lower()
+        # numeric path: keep digits, dot, sign and k/m, then split number and suffix
+        parts = s.str.replace(_SALARY_STRIP_PATTERN, "", regex=True).str.extract(_KM_RE.pattern)
+        num = pd.to_numeric(parts[0], errors="coerce").astype(float) * parts[1].map(SUFFIX_SCALE)
+        numeric = num.notna()
+        # text path: only the leftovers go through the precomputed phrase table
+        num = num.fillna(_phrase_keys(s[~numeric]).map(WORD2NUM))
+        # rare remainder ("50000-60000", "1.2.3"): text_to_number's full fallback chain
+        rest = num.isna() & s.notna()
+        if rest.any():
+            num.loc[rest] = s[rest].map(text_to_number).astype(float)
+        df["salary"] = num
+        STATS["salary_numeric_parsed"] = int(numeric.sum())
+        STATS["salary_text_parsed"] = int((num.notna() & ~numeric).sum())
+        STATS["salary_failed"] = int(num.isna().sum())
     if "phone" in df.columns:
-        df["phone"] = df["phone"].apply(clean_phone)
+        digits = df["phone"].astype("string").str.replace(_NON_DIGIT_PATTERN, "", regex=True)
+        parts = digits.str.extract(_NANP_PATTERN)
+        us = parts[0].notna()
+        intl = ~us & (digits.str.len() > 10).fillna(False)
+        phone = "(" + parts[0] + ") " + parts[1] + "-" + parts[2]
+        df["phone"] = phone.mask(intl, "+" + digits)
+        STATS["phone_parsed_us"] = int(us.sum())
+        STATS["phone_parsed_intl"] = int(intl.sum())
+        STATS["phone_failed"] = len(df) - STATS["phone_parsed_us"] - STATS["phone_parsed_intl"]
     if "join_date" in df.columns:
-        df["join_date"] = df["join_date"].apply(clean_date)
+        # parse the whole column once, then retry only the failures as dayfirst
+        dt = _parse_dates(df["join_date"])
+        retry = dt.isna() & df["join_date"].notna()
+        if retry.any():
+            dt.loc[retry] = _parse_dates(df.loc[retry, "join_date"], dayfirst=True)
+        df["join_date"] = dt.dt.strftime("%Y-%m-%d")
+        STATS["date_parsed"] = int(dt.notna().sum())
+        STATS["date_failed"] = len(df) - STATS["date_parsed"]
+    return df
+
+
+# -------- main pipeline --------
+def main():
+    p = Path(INPUT_FILE)
+    if not p.exists():
+        print(f"Input file not found: {INPUT_FILE}")
+        return
+
+    df = pd.read_csv(p, engine="pyarrow", dtype_backend="pyarrow")
+    STATS["rows_before"] = len(df)
+
+    df = clean_frame(df)
 
     # Remove duplicates
     df = df.drop_duplicates()
@@ -271,26 +300,29 @@ def main():
     df.to_csv(OUTPUT_FILE, index=False)
 
     # Produce a short report
-    with open(REPORT_FILE, "w", encoding="utf-8") as f:
-        f.write("Data Quality Report\n")
-        f.write("=" * 50 + "\n")
-        f.write(f"Input file: {INPUT_FILE}\n")
-        f.write(f"Rows before: {STATS['rows_before']}\n")
-        f.write(f"Rows after:  {STATS['rows_after']}\n\n")
-        f.write("Conversion counts:\n")
-        f.write(f"  salary_numeric_parsed: {STATS['salary_numeric_parsed']}\n")
-        f.write(f"  salary_text_parsed:    {STATS['salary_text_parsed']}\n")
-        f.write(f"  salary_failed:         {STATS['salary_failed']}\n")
-        f.write(f"  age_numeric_parsed:    {STATS['age_numeric_parsed']}\n")
-        f.write(f"  age_text_parsed:       {STATS['age_text_parsed']}\n")
-        f.write(f"  age_failed:            {STATS['age_failed']}\n")
-        f.write(f"  phone_parsed_us:       {STATS['phone_parsed_us']}\n")
-        f.write(f"  phone_parsed_intl:     {STATS['phone_parsed_intl']}\n")
-        f.write(f"  phone_failed:          {STATS['phone_failed']}\n")
-        f.write(f"  date_parsed:           {STATS['date_parsed']}\n")
-        f.write(f"  date_failed:           {STATS['date_failed']}\n")
-        f.write(f"  invalid_emails_removed:{STATS['invalid_emails_removed']}\n\n")
-        f.write("Generated on: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n")
+    lines = [
+        "Data Quality Report\n",
+        "=" * 50 + "\n",
+        f"Input file: {INPUT_FILE}\n",
+        f"Rows before: {STATS['rows_before']}\n",
+        f"Rows after:  {STATS['rows_after']}\n\n",
+        "Conversion counts:\n",
+        f"  salary_numeric_parsed: {STATS['salary_numeric_parsed']}\n",
+        f"  salary_text_parsed:    {STATS['salary_text_parsed']}\n",
+        f"  salary_failed:         {STATS['salary_failed']}\n",
+        f"  age_numeric_parsed:    {STATS['age_numeric_parsed']}\n",
+        f"  age_text_parsed:       {STATS['age_text_parsed']}\n",
+        f"  age_failed:            {STATS['age_failed']}\n",
+        f"  phone_parsed_us:       {STATS['phone_parsed_us']}\n",
+        f"  phone_parsed_intl:     {STATS['phone_parsed_intl']}\n",
+        f"  phone_failed:          {STATS['phone_failed']}\n",
+        f"  date_parsed:           {STATS['date_parsed']}\n",
+        f"  date_failed:           {STATS['date_failed']}\n",
+        f"  invalid_emails_removed:{STATS['invalid_emails_removed']}\n\n",
+        "Generated on: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n",
+    ]
+    with open(REPORT_FILE, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.write("".join(lines))
 
     print("Cleaning complete.")
     print(f"Cleaned data written to: {OUTPUT_FILE}")
@@ -14,10 +14,26 @@ OUTPUT_FILE = "merged_customers.csv"
 REPORT_FILE = "merge_report.txt"
 
 
+def _parse_dates(values):
+    """Parse a date column to naive datetime64, keeping each value's local wall time."""
+    try:
+        dt = pd.to_datetime(values, errors="coerce", format="mixed")
+    except ValueError:
+        # naive and offset dates mixed: to_datetime raises even with errors="coerce",
+        # so parse value by value and drop each offset on its own
+        def one(v):
+            ts = pd.to_datetime(v, errors="coerce", format="mixed")
+            return ts.tz_localize(None) if ts.tz is not None else ts
+        dt = pd.to_datetime(values.map(one))
+    if dt.dt.tz is not None:
+        dt = dt.dt.tz_localize(None)
+    return dt
+
+
 def merge_customers():
     # Load both CSVs
-    q1 = pd.read_csv(Q1_FILE)
-    q2 = pd.read_csv(Q2_FILE)
+    q1 = pd.read_csv(Q1_FILE, engine="pyarrow", dtype_backend="pyarrow")
+    q2 = pd.read_csv(Q2_FILE, engine="pyarrow", dtype_backend="pyarrow")
 
     # Ensure consistent column names (strip spaces, lowercase)
     q1.columns = q1.columns.str.strip().str.lower()
@@ -30,8 +46,13 @@ def merge_customers():
     # Combine datasets
     combined = pd.concat([q1, q2], ignore_index=True)
 
+    # Typed columns, parsed once for the whole frame, so dedup and the
+    # aggregations below work on numbers/datetimes instead of strings
+    combined["total_purchases"] = pd.to_numeric(combined["total_purchases"], errors="coerce")
+    combined["registration_date"] = _parse_dates(combined["registration_date"])
+
     # Drop exact duplicates (all columns identical)
-    combined = combined.drop_duplicates()
+    combined.drop_duplicates(keep="first", ignore_index=True, inplace=True)
 
     # Prepare report stats
     report_lines = []
@@ -41,48 +62,44 @@ def merge_customers():
     unique_customers_before = combined["customer_id"].nunique()
     report_lines.append(f"Unique customers before deduplication: {unique_customers_before}")
 
-    # Conflict resolution
-    resolved_rows = []
-    conflicts = []
-
-    for cid, group in combined.groupby("customer_id"):
-        if len(group) == 1:
-            # Only one record → keep as is
-            resolved_rows.append(group.iloc[0].to_dict())
-        else:
-            # Conflict case (appears in both quarters)
-            q1_row = group[group["source"] == "Q1"].iloc[0] if "Q1" in group["source"].values else None
-            q2_row = group[group["source"] == "Q2"].iloc[0] if "Q2" in group["source"].values else None
-
-            # Start with Q2 data (latest)
-            merged = q2_row.to_dict() if q2_row is not None else {}
-
-            # If Q1 exists, resolve conflicts
-            if q1_row is not None:
-                # Combine purchases
-                try:
-                    merged["total_purchases"] = float(q1_row["total_purchases"]) + float(q2_row["total_purchases"])
-                except Exception:
-                    merged["total_purchases"] = q2_row["total_purchases"]
-
-                # Earliest registration date
-                try:
-                    d1 = pd.to_datetime(q1_row["registration_date"], errors="coerce")
-                    d2 = pd.to_datetime(q2_row["registration_date"], errors="coerce")
-                    merged["registration_date"] = min(d1, d2).strftime("%Y-%m-%d")
-                except Exception:
-                    merged["registration_date"] = q2_row["registration_date"]
-
-                # Log conflicts if other columns differ
-                for col in group.columns:
-                    if col not in ["customer_id", "total_purchases", "registration_date", "source"]:
-                        if pd.notna(q1_row[col]) and pd.notna(q2_row[col]) and q1_row[col] != q2_row[col]:
-                            conflicts.append((cid, col, q1_row[col], q2_row[col]))
-
-            resolved_rows.append(merged)
-
-    # Create final dataframe
-    merged_df = pd.DataFrame(resolved_rows)
+    # Customers seen only once need no resolution; only the rest go through groupby.
+    # Blank ids are dropped first (as the groupby would), since duplicated() treats
+    # them as equal and a lone blank id would otherwise slip through as a single.
+    keyed = combined.dropna(subset=["customer_id"])
+    dup_mask = keyed.duplicated("customer_id", keep=False)
+    singles = keyed.loc[~dup_mask]
+    dups = keyed.loc[dup_mask]
+
+    # Conflict resolution: one groupby reduction instead of a Python loop per customer.
+    # Q2 rows come after Q1 rows in `combined`, so "last" keeps the latest value.
+    agg_map = {c: "last" for c in combined.columns if c != "customer_id"}
+    agg_map.update(total_purchases="sum", registration_date="min")
+    grouped = dups.groupby("customer_id", sort=False)
+    resolved = grouped.agg(agg_map)
+    # min_count=1: purchases blank in every row stay NaN, as they do for singles
+    resolved["total_purchases"] = grouped["total_purchases"].sum(min_count=1)
+    merged_df = pd.concat([singles, resolved.reset_index()], ignore_index=True)
+    merged_df = merged_df.sort_values("customer_id", kind="stable", ignore_index=True)
+    merged_df["registration_date"] = merged_df["registration_date"].dt.strftime("%Y-%m-%d")
+
+    # Log conflicts where other columns differ within a customer (first vs kept value)
+    compare_cols = [c for c in combined.columns
+                    if c not in ["customer_id", "total_purchases", "registration_date", "source"]]
+    differs = (grouped[compare_cols].nunique() > 1).stack()
+    # Conflicts as column arrays (one entry per flagged customer/column pair)
+    # gathered by index lookups, rather than a list of per-row tuples
+    pairs = differs.index[differs.to_numpy()]
+    cids = pairs.get_level_values(0)
+    first = grouped[compare_cols + ["source"]].first()
+    last = grouped[compare_cols + ["source"]].last()
+    conflicts = pd.DataFrame({
+        "customer_id": cids,
+        "column": pairs.get_level_values(1),
+        "first_source": first["source"].reindex(cids).to_numpy(),
+        "first_value": first[compare_cols].stack().reindex(pairs).to_numpy(),
+        "kept_source": last["source"].reindex(cids).to_numpy(),
+        "kept_value": last[compare_cols].stack().reindex(pairs).to_numpy(),
+    })
 
     # Drop "source" column if present
     if "source" in merged_df.columns:
@@ -107,16 +124,16 @@ def merge_customers():
 
     # Conflict details
     report_lines.append("\nConflicts Resolved:")
-    if conflicts:
-        for cid, col, val1, val2 in conflicts:
-            report_lines.append(f"Customer {cid}: Column '{col}' -> Q1='{val1}', Q2='{val2}' (Q2 kept)")
+    if len(conflicts):
+        for cid, col, src1, val1, src2, val2 in conflicts.itertuples(index=False):
+            report_lines.append(f"Customer {cid}: Column '{col}' -> {src1}='{val1}', {src2}='{val2}' ({src2} kept)")
     else:
         report_lines.append("No conflicting data found.")
 
     # Save report
-    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+    report_lines.append("Generated on: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    with open(REPORT_FILE, "w", encoding="utf-8", buffering=1 << 16) as f:
         f.write("\n".join(report_lines))
-        f.write("\nGenerated on: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
     print("\n--- Merge Completed ---")
     print(f"Final dataset saved to {OUTPUT_FILE}")